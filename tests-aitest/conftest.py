@@ -9,7 +9,10 @@ Run with: uv run pytest tests-aitest/ -v
 
 from __future__ import annotations
 
+import hashlib
+import json
 import os
+import pickle
 import sys
 from pathlib import Path
 
@@ -74,5 +77,79 @@ def excel_server():
             "--manifest",
             str(MANIFEST_PATH),
         ],
-        wait=Wait.for_tools(["get_range_values", "set_range_values", "list_sheets"]),
+        wait=Wait.for_tools(
+            ["get_range_values", "get_used_range", "set_range_values", "list_sheets"]
+        ),
     )
+
+
+# ---------------------------------------------------------------------------
+# Token usage reporting
+# ---------------------------------------------------------------------------
+
+# Tests append (label, token_usage) here instead of printing mid-run; the
+# whole log is emitted once as a single table when the session finishes.
+TOKEN_LOG: list[tuple[str, dict]] = []
+
+
+def pytest_sessionfinish(session: pytest.Session) -> None:
+    """Print the accumulated token report in one write."""
+    if not TOKEN_LOG:
+        return
+    lines = ["", "=" * 70, "TOKEN USAGE SUMMARY", "=" * 70]
+    for label, usage in TOKEN_LOG:
+        prompt = usage.get("prompt", 0)
+        completion = usage.get("completion", 0)
+        lines.append(
+            f"  {label}: prompt={prompt:,} completion={completion:,} "
+            f"total={prompt + completion:,}"
+        )
+    print("\n".join(lines))
+
+
+# ---------------------------------------------------------------------------
+# Optional LLM response cache
+# ---------------------------------------------------------------------------
+
+# Dev-iteration cache for agent runs: re-running an unchanged test re-sends
+# the exact same prompt to the LLM, which is slow and costs money. With
+# OCA_LLM_CACHE=1, identical (model, system prompt, tools, prompt) runs are
+# served from .pytest_cache instead. Off by default so CI always hits the API.
+
+
+def _agent_cache_key(agent, prompt: str) -> str:
+    provider = getattr(agent, "provider", None)
+    payload = {
+        "model": getattr(provider, "model", ""),
+        "system": getattr(agent, "system_prompt", ""),
+        "tools": sorted(getattr(agent, "allowed_tools", None) or []),
+        "max_turns": getattr(agent, "max_turns", None),
+        "prompt": prompt,
+    }
+    return hashlib.sha256(
+        json.dumps(payload, sort_keys=True, default=str).encode("utf-8")
+    ).hexdigest()
+
+
+@pytest.fixture
+def aitest_run(aitest_run, request):
+    """Wrap the plugin's aitest_run with an exact-match result cache."""
+    if os.environ.get("OCA_LLM_CACHE") != "1":
+        return aitest_run
+
+    inner = aitest_run
+    cache_dir = request.config.cache.mkdir("llm-cache")
+
+    async def cached_run(agent, prompt, **kwargs):
+        key = _agent_cache_key(agent, prompt)
+        path = cache_dir / key
+        if path.exists():
+            return pickle.loads(path.read_bytes())
+        result = await inner(agent, prompt, **kwargs)
+        try:
+            path.write_bytes(pickle.dumps(result))
+        except (pickle.PicklingError, TypeError):
+            pass  # unpicklable results simply aren't cached
+        return result
+
+    return cached_run
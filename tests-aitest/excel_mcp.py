@@ -10,21 +10,58 @@ Run as: python tests-aitest/excel_mcp.py --manifest src/tools/tools-manifest.jso
 from __future__ import annotations
 
 import argparse
+import functools
 import inspect
 import json
+import logging
+import re
 import sys
+from collections.abc import Callable
+from datetime import datetime
 from pathlib import Path
-from typing import Annotated, Any
+from typing import Annotated, Any, NamedTuple
 
 from mcp.server.fastmcp import FastMCP
 from pydantic import Field
 
 from excel_sim import ExcelSimulator
 
+def _json_default(o: Any) -> str:
+    """Encode the simulator's non-JSON-native leaves.
+
+    Typed fast path for datetime (the common case in cell values) before
+    the catch-all str(), so the encoder skips repr-style type probing.
+    (orjson serializes datetime natively and only calls this for the rest.)
+    """
+    if isinstance(o, datetime):
+        return o.isoformat()
+    return str(o)
+
+
+# orjson parses and encodes JSON 2-5× faster than the stdlib module; fall
+# back to json so the server still runs where the wheel is unavailable.
+try:
+    import orjson
+
+    def _dumps(value: Any) -> str:
+        return orjson.dumps(value, default=_json_default).decode()
+
+    def _loads(data: bytes) -> Any:
+        return orjson.loads(data)
+except ImportError:  # pragma: no cover
+
+    def _dumps(value: Any) -> str:
+        return json.dumps(value, default=_json_default)
+
+    def _loads(data: bytes) -> Any:
+        return json.loads(data)
+
 # ---------------------------------------------------------------------------
 # Server & simulator
 # ---------------------------------------------------------------------------
 
+logger = logging.getLogger("excel_mcp")
+
 mcp = FastMCP("excel-ai-addin-test-server")
 _sim = ExcelSimulator()
 
@@ -32,8 +69,20 @@ _sim = ExcelSimulator()
 # Tool routing — maps manifest tool names to simulator methods
 # ---------------------------------------------------------------------------
 
+# Matches a lowercase/digit → uppercase boundary in a camelCase name.
+_CAMEL_BOUNDARY_RE = re.compile(r"([a-z0-9])([A-Z])")
+
+
+def _camel_to_snake(name: str) -> str:
+    """Convert a camelCase manifest param name to snake_case."""
+    return _CAMEL_BOUNDARY_RE.sub(r"\1_\2", name).lower()
+
+
 # Mapping from manifest tool name → (simulator_method_name, param_remapping)
 # Most tools map 1:1. Decomposed tools merge back into generic methods.
+# At register_tools time the remapping is merged with a precomputed
+# camelCase→snake_case table covering every manifest param, so dispatch
+# never has to derive names per call.
 _TOOL_ROUTES: dict[str, tuple[str, dict[str, str] | None]] = {
     # Range
     "get_range_values": ("get_range_values", {"sheetName": "sheet_name", "maxRows": "max_rows", "maxColumns": "max_columns", "startRow": "start_row", "startColumn": "start_column"}),
@@ -49,7 +98,9 @@ _TOOL_ROUTES: dict[str, tuple[str, dict[str, str] | None]] = {
     "sort_range": ("sort_range", None),
     "copy_range": ("copy_range", {"sourceAddress": "source_address", "destinationAddress": "destination_address",
                                    "sourceSheetName": "source_sheet_name", "destinationSheetName": "destination_sheet_name"}),
-    "find_values": ("find_values", {"matchCase": "match_case"}),
+    # searchValue maps to itself: the simulator method kept the camelCase
+    # name, so the auto-derived snake_case conversion must not apply.
+    "find_values": ("find_values", {"matchCase": "match_case", "searchValue": "searchValue"}),
     "insert_range": ("insert_range", None),
     "delete_range": ("delete_range", None),
     "merge_cells": ("merge_cells", None),
@@ -137,71 +188,132 @@ _TOOL_ROUTES: dict[str, tuple[str, dict[str, str] | None]] = {
     "remove_pivot_field": ("remove_pivot_field", {"pivotTableName": "pivot_table_name", "fieldName": "field_name", "fieldType": "field_type"}),
 }
 
+# Intern tool and param names once so the per-call dict lookups in dispatch
+# compare by pointer instead of re-hashing the same short strings.
+_TOOL_ROUTES = {
+    sys.intern(name): (
+        sys.intern(method_name),
+        {sys.intern(k): sys.intern(v) for k, v in remap.items()} if remap else None,
+    )
+    for name, (method_name, remap) in _TOOL_ROUTES.items()
+}
 
-def _remap_params(params: dict[str, Any], remap: dict[str, str] | None) -> dict[str, Any]:
-    """Remap camelCase param names from manifest to snake_case for Python methods."""
-    if not remap:
-        # Default: convert common camelCase patterns
-        result = {}
-        for k, v in params.items():
-            if v is None:
-                continue
-            # Convert camelCase to snake_case
-            snake = ""
-            for i, c in enumerate(k):
-                if c.isupper() and i > 0:
-                    snake += "_"
-                snake += c.lower()
-            result[snake] = v
-        return result
-
-    result = {}
-    for k, v in params.items():
-        if v is None:
-            continue
-        key = remap.get(k, k)
-        result[key] = v
-    return result
+
+# Dispatch kinds — how _dispatch hands params to the simulator method.
+_KIND_NORMAL = 0
+_KIND_CONDITIONAL_FORMAT = 1
+_KIND_DATA_VALIDATION = 2
+
+class Route(NamedTuple):
+    """Resolved dispatch entry for one tool, built once at registration."""
+
+    method: Callable[..., Any]
+    adapter: Callable[[dict[str, Any]], dict[str, Any]]
+
+
+def _make_adapter(
+    remap: dict[str, str], kind: int, extra: str | None
+) -> Callable[[dict[str, Any]], dict[str, Any]]:
+    """Build the params adapter for one tool.
+
+    The adapter applies the precomputed remap and, for the decomposed
+    conditional-format/data-validation tools, injects the rule/validation
+    type — so dispatch itself carries no per-kind branching.
+    """
+    if kind == _KIND_NORMAL:
+        def adapter(params: dict[str, Any]) -> dict[str, Any]:
+            return {remap.get(k, k): v for k, v in params.items() if v is not None}
+    else:
+        type_key = "rule_type" if kind == _KIND_CONDITIONAL_FORMAT else "validation_type"
+
+        def adapter(params: dict[str, Any]) -> dict[str, Any]:
+            py_params = {
+                remap.get(k, k): v
+                for k, v in params.items()
+                if v is not None and k != "address" and k != "sheetName"
+            }
+            py_params[type_key] = extra
+            py_params["address"] = params.get("address") or ""
+            py_params["sheet_name"] = params.get("sheetName")
+            return py_params
+
+    return adapter
+
+
+# Flat per-tool table built once in register_tools: tool name → Route with
+# the bound simulator method and the params adapter. Dispatch is then a
+# single dict lookup and two calls, with no branching per invocation.
+_DISPATCH_TABLE: dict[str, Route] = {}
+
+# Open-addressed probe table over _DISPATCH_TABLE, sized to a power of two
+# ≥ 2×N so most interned tool names land in their home slot. Each slot is
+# (interned_name, route) or None; dispatch verifies by identity and falls
+# back to the dict on a collision or miss, so correctness never depends on
+# the table.
+_ROUTE_TABLE: tuple[tuple[str, Route] | None, ...] = ()
+_ROUTE_MASK = 0
+
+
+def _build_route_table() -> None:
+    """(Re)build the probe table after _DISPATCH_TABLE is populated."""
+    global _ROUTE_TABLE, _ROUTE_MASK
+    size = 1
+    while size < 2 * len(_DISPATCH_TABLE):
+        size *= 2
+    slots: list[tuple[str, Route] | None] = [None] * size
+    mask = size - 1
+    for name, route in _DISPATCH_TABLE.items():
+        idx = hash(name) & mask
+        if slots[idx] is None:
+            slots[idx] = (name, route)
+    _ROUTE_TABLE = tuple(slots)
+    _ROUTE_MASK = mask
+
+
+# Tool names are plain identifiers, so the error response can be built by
+# string substitution without running a JSON encoder.
+_UNKNOWN_TOOL_TEMPLATE = '{"error": "Unknown tool: %s"}'
+
+
+@functools.lru_cache(maxsize=256)
+def _encode_error(msg: str) -> str:
+    """Encode a simulator error payload, caching the finite set of messages."""
+    return _dumps({"error": msg})
 
 
 def _dispatch(tool_name: str, params: dict[str, Any]) -> str:
     """Route a tool call to the appropriate simulator method."""
-    route = _TOOL_ROUTES.get(tool_name)
-    if not route:
-        return json.dumps({"error": f"Unknown tool: {tool_name}"})
-
-    method_name, remap = route
-    method = getattr(_sim, method_name, None)
-    if not method:
-        return json.dumps({"error": f"Simulator has no method: {method_name}"})
-
-    # Special handling for decomposed conditional format tools
-    if tool_name.startswith("add_") and method_name == "add_conditional_format":
-        rule_type = tool_name.replace("add_", "")
-        py_params = _remap_params(params, remap)
-        address = py_params.pop("address", "")
-        sheet_name = py_params.pop("sheet_name", None)
-        result = method(rule_type=rule_type, address=address, sheet_name=sheet_name, **py_params)
-    elif tool_name.startswith("set_") and method_name == "set_data_validation":
-        validation_type = tool_name.replace("set_", "").replace("_validation", "")
-        py_params = _remap_params(params, remap)
-        address = py_params.pop("address", "")
-        sheet_name = py_params.pop("sheet_name", None)
-        result = method(validation_type=validation_type, address=address, sheet_name=sheet_name, **py_params)
+    slot = _ROUTE_TABLE[hash(tool_name) & _ROUTE_MASK] if _ROUTE_TABLE else None
+    if slot is not None and slot[0] is tool_name:
+        route = slot[1]
     else:
-        py_params = _remap_params(params, remap)
-        result = method(**py_params)
+        route = _DISPATCH_TABLE.get(tool_name)
+        if route is None:
+            return _UNKNOWN_TOOL_TEMPLATE % tool_name
+
+    result = route.method(**route.adapter(params))
 
     if result.success:
-        return json.dumps(result.value, default=str)
-    return json.dumps({"error": result.error})
+        return _dumps(result.value)
+    return _encode_error(result.error)
 
 
 def _load_manifest(manifest_path: Path) -> list[dict[str, Any]]:
-    """Load and return tools from the manifest file."""
-    with manifest_path.open() as f:
-        manifest = json.load(f)
-    return manifest["tools"]
+    """Load and return tools from the manifest file.
+
+    Tools are still registered eagerly: MCP clients (and the test fixtures'
+    Wait.for_tools) expect the full tool list as soon as the server is up,
+    so only the parse itself is accelerated.
+    """
+    tools = _loads(manifest_path.read_bytes())["tools"]
+    # Intern names coming off the wire so they share identity with the
+    # interned keys in _TOOL_ROUTES and the dispatch table.
+    for tool_def in tools:
+        tool_def["name"] = sys.intern(tool_def["name"])
+        params = tool_def.get("params")
+        if params:
+            tool_def["params"] = {sys.intern(k): v for k, v in params.items()}
+    return tools
 
 
 def _build_tool_docstring(tool_def: dict[str, Any]) -> str:
@@ -216,6 +328,105 @@ def _build_tool_docstring(tool_def: dict[str, Any]) -> str:
     return doc
 
 
+@functools.lru_cache(maxsize=None)
+def _build_parameter(
+    pname: str,
+    ptype: str,
+    required: bool,
+    desc: str,
+    enum_values: tuple[str, ...] | None,
+) -> inspect.Parameter:
+    """Build (and cache) the annotated inspect.Parameter for one param.
+
+    Param descriptors repeat heavily across the ~90 tools (sheetName,
+    address, …), so caching skips re-evaluating the Pydantic Field and
+    Parameter validation for every duplicate. Parameters are immutable
+    and safe to share between signatures.
+    """
+    if ptype == "string":
+        base: Any = str
+    elif ptype == "number":
+        base = float
+    elif ptype == "boolean":
+        base = bool
+    elif ptype in ("string[]",):
+        base = list[str]
+    elif ptype in ("any[][]", "string[][]"):
+        base = list[list[Any]]
+    else:
+        base = str
+
+    # Build Pydantic Field with description + optional enum.
+    # Use base type directly (not base | None) so FastMCP
+    # generates {"type": "string"} instead of {"anyOf": [{string}, {null}]},
+    # matching how Zod .optional() serializes in production.
+    extra = {"enum": list(enum_values)} if enum_values else None
+
+    if not required:
+        ann = Annotated[base, Field(default=None, description=desc, json_schema_extra=extra)]
+        return inspect.Parameter(
+            pname,
+            inspect.Parameter.POSITIONAL_OR_KEYWORD,
+            default=None,
+            annotation=ann,
+        )
+    ann = Annotated[base, Field(description=desc, json_schema_extra=extra)]
+    return inspect.Parameter(
+        pname,
+        inspect.Parameter.POSITIONAL_OR_KEYWORD,
+        annotation=ann,
+    )
+
+
+def _build_signature(params_meta: dict[str, Any]) -> tuple[inspect.Signature, dict[str, Any]]:
+    """Build the inspect.Signature + annotations FastMCP introspects.
+
+    FastMCP exposes individual parameters with descriptions and enum
+    constraints matching what the production Zod schemas generate. It
+    reads the signature eagerly at registration, so construction cannot
+    be deferred — but the per-param pieces are cached in _build_parameter.
+    """
+    # Required params must come before optional ones in the signature;
+    # split them while building instead of re-filtering afterwards.
+    required_params: list[inspect.Parameter] = []
+    optional_params: list[inspect.Parameter] = []
+    annotations: dict[str, Any] = {}
+    for pname, pdef in params_meta.items():
+        enum_values = pdef.get("enum")
+        param = _build_parameter(
+            pname,
+            pdef.get("type", "string"),
+            pdef.get("required", True),
+            pdef.get("description", ""),
+            tuple(enum_values) if enum_values else None,
+        )
+        if param.default is inspect.Parameter.empty:
+            required_params.append(param)
+        else:
+            optional_params.append(param)
+        annotations[pname] = param.annotation
+
+    annotations["return"] = str
+    return inspect.Signature(required_params + optional_params, return_annotation=str), annotations
+
+
+def _make_handler(tool_name: str, description: str, params_meta: dict[str, Any]) -> Any:
+    """Create the FastMCP-facing handler for one manifest tool.
+
+    Every handler shares the same one-line body — a straight call into
+    _dispatch — so the only per-tool state is the metadata FastMCP
+    introspects. (FastMCP derives the input schema from the signature;
+    it has no API for registering a raw schema dict directly.)
+    """
+    def handler(**kwargs: Any) -> str:
+        return _dispatch(tool_name, kwargs)
+
+    handler.__name__ = tool_name
+    handler.__doc__ = _build_tool_docstring({"description": description, "params": params_meta})
+    handler.__signature__, handler.__annotations__ = _build_signature(params_meta)  # type: ignore[attr-defined]
+    return handler
+
+
 def register_tools(manifest_path: Path) -> None:
     """Register all manifest tools as MCP tools backed by the simulator."""
     tools = _load_manifest(manifest_path)
@@ -226,77 +437,45 @@ def register_tools(manifest_path: Path) -> None:
         if tool_name not in _TOOL_ROUTES:
             continue
 
-        # Build the param signature for the tool
         params_meta = tool_def.get("params", {})
 
-        # Create a closure-based handler
-        def make_handler(tn: str, pm: dict[str, Any]) -> Any:
-            """Create a tool handler closure."""
-            def handler(**kwargs: Any) -> str:
-                return _dispatch(tn, kwargs)
-
-            # Set function metadata for FastMCP
-            handler.__name__ = tn
-            handler.__doc__ = _build_tool_docstring({"description": tool_def["description"], "params": pm})
-
-            # Build proper inspect.Signature so FastMCP exposes individual
-            # parameters with descriptions and enum constraints matching
-            # what the production Zod schemas generate.
-            sig_params: list[inspect.Parameter] = []
-            annotations: dict[str, Any] = {}
-            for pname, pdef in pm.items():
-                ptype = pdef.get("type", "string")
-                required = pdef.get("required", True)
-                desc = pdef.get("description", "")
-                enum_values = pdef.get("enum")
-
-                if ptype == "string":
-                    base = str
-                elif ptype == "number":
-                    base = float
-                elif ptype == "boolean":
-                    base = bool
-                elif ptype in ("string[]",):
-                    base = list[str]
-                elif ptype in ("any[][]", "string[][]"):
-                    base = list[list[Any]]
-                else:
-                    base = str
-
-                # Build Pydantic Field with description + optional enum.
-                # Use base type directly (not base | None) so FastMCP
-                # generates {"type": "string"} instead of {"anyOf": [{string}, {null}]},
-                # matching how Zod .optional() serializes in production.
-                extra = {"enum": enum_values} if enum_values else None
-
-                if not required:
-                    ann = Annotated[base, Field(default=None, description=desc, json_schema_extra=extra)]
-                    sig_params.append(inspect.Parameter(
-                        pname,
-                        inspect.Parameter.POSITIONAL_OR_KEYWORD,
-                        default=None,
-                        annotation=ann,
-                    ))
-                else:
-                    ann = Annotated[base, Field(description=desc, json_schema_extra=extra)]
-                    sig_params.append(inspect.Parameter(
-                        pname,
-                        inspect.Parameter.POSITIONAL_OR_KEYWORD,
-                        annotation=ann,
-                    ))
-                annotations[pname] = ann
-
-            annotations["return"] = str
-            # Required params must come before optional ones in the signature
-            required_params = [p for p in sig_params if p.default is inspect.Parameter.empty]
-            optional_params = [p for p in sig_params if p.default is not inspect.Parameter.empty]
-            handler.__signature__ = inspect.Signature(required_params + optional_params, return_annotation=str)
-            handler.__annotations__ = annotations
-
-            return handler
-
-        handler = make_handler(tool_name, params_meta)
-        mcp.tool()(handler)
+        # Merge the default camelCase→snake_case conversion for every manifest
+        # param with any explicit remap, so dispatch does a plain dict lookup
+        # per key on the hot path.
+        method_name, explicit_remap = _TOOL_ROUTES[tool_name]
+        full_remap = {pname: sys.intern(_camel_to_snake(pname)) for pname in params_meta}
+        if explicit_remap:
+            full_remap.update(explicit_remap)
+
+        # Bind the simulator method and precompute the decomposed-tool kind
+        # once, instead of getattr + startswith checks on every call.
+        method = getattr(_sim, method_name)
+
+        # Fail at registration, not per call, if a merged remap targets a
+        # parameter the bound method does not accept (e.g. an auto-derived
+        # snake_case name for a method that kept the camelCase spelling).
+        sig_params = inspect.signature(method).parameters
+        if not any(p.kind is inspect.Parameter.VAR_KEYWORD for p in sig_params.values()):
+            for target in full_remap.values():
+                if target not in sig_params:
+                    raise RuntimeError(
+                        f"{tool_name}: remapped param '{target}' is not accepted "
+                        f"by ExcelSimulator.{method_name}()"
+                    )
+        if method_name == "add_conditional_format" and tool_name.startswith("add_"):
+            kind, extra = _KIND_CONDITIONAL_FORMAT, tool_name.replace("add_", "")
+        elif method_name == "set_data_validation" and tool_name.startswith("set_"):
+            kind, extra = _KIND_DATA_VALIDATION, tool_name.replace("set_", "").replace("_validation", "")
+        else:
+            kind, extra = _KIND_NORMAL, None
+        _DISPATCH_TABLE[tool_name] = Route(method, _make_adapter(full_remap, kind, extra))
+
+        handler = _make_handler(tool_name, tool_def["description"], params_meta)
+        # Call add_tool directly instead of mcp.tool()(handler): same
+        # registration, minus one decorator-factory closure per tool.
+        mcp.add_tool(handler, name=tool_name)
+
+    _build_route_table()
 
 
 # ---------------------------------------------------------------------------
@@ -327,8 +506,22 @@ def main() -> None:
         print("Run 'npm run manifest' first.", file=sys.stderr)
         raise SystemExit(1)
 
+    logging.basicConfig(level=logging.INFO, stream=sys.stderr, format="%(message)s")
+
     register_tools(args.manifest)
-    print(f"Registered {len(mcp._tool_manager._tools)} tools from {args.manifest}", file=sys.stderr)
+    if logger.isEnabledFor(logging.INFO):
+        logger.info("Registered %d tools from %s", len(_DISPATCH_TABLE), args.manifest)
+
+    # uvloop swaps the selector event loop for a libuv-backed one, which
+    # cuts per-message overhead noticeably under many tool calls. POSIX
+    # only, and purely optional.
+    if sys.platform != "win32":
+        try:
+            import uvloop
+
+            uvloop.install()
+        except ImportError:
+            pass
 
     mcp.settings.host = args.host
     mcp.settings.port = args.port
@@ -8,9 +8,13 @@ tables/charts/comments, and apply formatting/validation via the tools.
 
 from __future__ import annotations
 
+import functools
 import re
+import sys
+from collections import defaultdict
 from dataclasses import dataclass, field
-from typing import Any
+from types import MappingProxyType
+from typing import Any, Callable, Mapping
 
 
 # ---------------------------------------------------------------------------
@@ -19,7 +23,7 @@ from typing import Any
 # ---------------------------------------------------------------------------
 
 
-@dataclass
+@dataclass(slots=True)
 class ToolResult:
     """Result from a tool call."""
 
@@ -31,22 +35,26 @@ class ToolResult:
         """Convert to dictionary for JSON serialization."""
         return {"success": self.success, "value": self.value, "error": self.error}
 
+    @classmethod
+    def ok(cls, value: Any) -> ToolResult:
+        """Build a success result without going through __init__.
+
+        Bypasses the generated dataclass constructor (argument binding and
+        default handling) — worthwhile because every tool call allocates one.
+        """
+        self = cls.__new__(cls)
+        self.success = True
+        self.value = value
+        self.error = None
+        return self
+
 
 # ---------------------------------------------------------------------------
 # Data models
 # ---------------------------------------------------------------------------
 
 
-@dataclass
-class Comment:
-    """A cell comment."""
-
-    cell_address: str
-    text: str
-    sheet_name: str
-
-
-@dataclass
+@dataclass(slots=True)
 class Table:
     """A named table on a sheet."""
 
@@ -60,7 +68,7 @@ class Table:
         return f"tbl_{self.name}"
 
 
-@dataclass
+@dataclass(slots=True)
 class Chart:
     """A chart on a sheet."""
 
@@ -71,7 +79,7 @@ class Chart:
     title: str = ""
 
 
-@dataclass
+@dataclass(slots=True)
 class ConditionalFormat:
     """A conditional format rule."""
 
@@ -81,7 +89,7 @@ class ConditionalFormat:
     params: dict[str, Any] = field(default_factory=dict)
 
 
-@dataclass
+@dataclass(slots=True)
 class DataValidation:
     """A data validation rule."""
 
@@ -91,7 +99,7 @@ class DataValidation:
     params: dict[str, Any] = field(default_factory=dict)
 
 
-@dataclass
+@dataclass(slots=True)
 class NamedRange:
     """A workbook-scoped named range."""
 
@@ -101,16 +109,35 @@ class NamedRange:
     comment: str = ""
 
 
-@dataclass
+# Default page layout shared by every pristine sheet; sheets only get
+# their own (mutable) copy once set_page_layout actually changes one.
+_DEFAULT_PAGE_LAYOUT: Mapping[str, Any] = MappingProxyType({
+    "orientation": "Portrait",
+    "paperSize": "Letter",
+    "margins": MappingProxyType({"left": 0.75, "right": 0.75, "top": 1, "bottom": 1}),
+})
+
+
+@dataclass(slots=True)
 class Sheet:
     """A worksheet with cells."""
 
     name: str
-    cells: dict[str, Any] = field(default_factory=dict)
-    formulas: dict[str, str] = field(default_factory=dict)
-    formats: dict[str, dict[str, Any]] = field(default_factory=dict)
-    number_formats: dict[str, str] = field(default_factory=dict)
-    merged: list[str] = field(default_factory=list)
+    # Per-cell stores are keyed by (row, 0-based column index) tuples so
+    # range loops never pay for A1-string assembly or parsing; addresses
+    # are only materialized when building a user-facing response.
+    cells: dict[tuple[int, int], Any] = field(default_factory=dict)
+    formulas: dict[tuple[int, int], str] = field(default_factory=dict)
+    formats: dict[tuple[int, int], dict[str, Any]] = field(default_factory=dict)
+    number_formats: dict[tuple[int, int], str] = field(default_factory=dict)
+    # Stringified/case-folded shadows of cells, maintained on write so
+    # find/replace scan ready-made strings instead of re-stringifying
+    # every cell on every search.
+    cells_str: dict[tuple[int, int], str] = field(default_factory=dict)
+    cells_lower: dict[tuple[int, int], str] = field(default_factory=dict)
+    # Insertion-ordered sets: dict keys give O(1) add/remove while
+    # preserving the order ranges were merged/grouped in.
+    merged: dict[str, None] = field(default_factory=dict)
     position: int = 0
     frozen_at: str | None = None
     is_protected: bool = False
@@ -119,13 +146,30 @@ class Sheet:
     hyperlinks: dict[str, dict[str, str]] = field(default_factory=dict)
     hidden_rows: set[int] = field(default_factory=set)
     hidden_columns: set[int] = field(default_factory=set)
-    grouped_rows: list[str] = field(default_factory=list)
-    grouped_columns: list[str] = field(default_factory=list)
-    page_layout: dict[str, Any] = field(default_factory=lambda: {
-        "orientation": "Portrait",
-        "paperSize": "Letter",
-        "margins": {"left": 0.75, "right": 0.75, "top": 1, "bottom": 1},
-    })
+    grouped_rows: dict[str, None] = field(default_factory=dict)
+    grouped_columns: dict[str, None] = field(default_factory=dict)
+    # Starts as a reference to the shared read-only template; un-aliased
+    # into a private dict by set_page_layout before the first mutation.
+    page_layout: Mapping[str, Any] = field(default_factory=lambda: _DEFAULT_PAGE_LAYOUT)
+    # Used-range bounds, maintained incrementally by the write paths so
+    # get_used_range never has to scan every cell. used_dirty requests a
+    # lazy rescan after a clear touches the boundary.
+    min_row: int = sys.maxsize
+    max_row: int = 0
+    min_col: int = sys.maxsize
+    max_col: int = 0
+    used_dirty: bool = False
+
+    def expand_used(self, start_row: int, end_row: int, start_col: int, end_col: int) -> None:
+        """Grow the cached used-range bounds to cover a written block."""
+        if start_row < self.min_row:
+            self.min_row = start_row
+        if end_row > self.max_row:
+            self.max_row = end_row
+        if start_col < self.min_col:
+            self.min_col = start_col
+        if end_col > self.max_col:
+            self.max_col = end_col
 
 
 # ---------------------------------------------------------------------------
@@ -133,16 +177,8 @@ class Sheet:
 # ---------------------------------------------------------------------------
 
 
-def _col_to_index(col: str) -> int:
-    """Convert column letter(s) to 0-based index. A=0, B=1, ..., Z=25, AA=26."""
-    result = 0
-    for c in col.upper():
-        result = result * 26 + (ord(c) - ord("A") + 1)
-    return result - 1
-
-
-def _index_to_col(idx: int) -> str:
-    """Convert 0-based index to column letter(s)."""
+def _index_to_col_slow(idx: int) -> str:
+    """Convert 0-based index to column letter(s) by arithmetic."""
     result = ""
     idx += 1
     while idx > 0:
@@ -151,35 +187,114 @@ def _index_to_col(idx: int) -> str:
     return result
 
 
+# Excel caps sheets at 16384 columns (XFD). Precomputing the full letter
+# table once turns the per-cell conversions inside every range loop into
+# plain tuple/dict lookups instead of divmod chains and string builds.
+_MAX_COLUMNS = 16384
+_IDX_TO_COL = tuple(_index_to_col_slow(i) for i in range(_MAX_COLUMNS))
+_COL_TO_IDX = {col: i for i, col in enumerate(_IDX_TO_COL)}
+
+
+def _col_to_index(col: str) -> int:
+    """Convert column letter(s) to 0-based index. A=0, B=1, ..., Z=25, AA=26."""
+    try:
+        return _COL_TO_IDX[col.upper()]
+    except KeyError:  # beyond XFD — keep the arithmetic as a fallback
+        result = 0
+        for c in col.upper():
+            result = result * 26 + (ord(c) - ord("A") + 1)
+        return result - 1
+
+
+def _index_to_col(idx: int) -> str:
+    """Convert 0-based index to column letter(s)."""
+    if idx < _MAX_COLUMNS:
+        return _IDX_TO_COL[idx]
+    return _index_to_col_slow(idx)
+
+
+# Sentinel distinguishing "cell absent" from stored falsy values like "" or 0.
+_MISSING = object()
+
+# Shared result for success-with-no-payload: every such ToolResult is
+# identical, so one instance serves all of them. Callers never mutate it.
+_EMPTY_OK = ToolResult(success=True, value=None, error=None)
+
+# Likewise for successes whose payload is an (immutable) empty listing.
+_EMPTY_LIST_OK = ToolResult(success=True, value=(), error=None)
+
+
+class _SimError(Exception):
+    """Internal signal for user-visible simulator errors.
+
+    Raised by helpers like _resolve_sheet and converted to an error
+    ToolResult at the tool-method boundary by _catch_sim_error, so the
+    methods themselves skip the per-call result-type checks.
+    """
+
+
+def _catch_sim_error(method: Callable[..., ToolResult]) -> Callable[..., ToolResult]:
+    """Convert _SimError raised inside a tool method into an error ToolResult."""
+
+    @functools.wraps(method)
+    def wrapper(*args: Any, **kwargs: Any) -> ToolResult:
+        try:
+            return method(*args, **kwargs)
+        except _SimError as exc:
+            return ToolResult(success=False, error=exc.args[0])
+
+    return wrapper
+
+
+# Tool workloads re-reference the same handful of addresses over and over,
+# so memoizing the parsers collapses nearly every parse to a cache hit.
+
+
+@functools.lru_cache(maxsize=65536)
 def _parse_cell(ref: str) -> tuple[str, int]:
-    """Parse 'A1' into ('A', 1)."""
-    m = re.match(r"([A-Za-z]+)(\d+)", ref)
-    if not m:
+    """Parse 'A1' into ('A', 1).
+
+    A hand-rolled split beats the regex engine by a wide margin for
+    inputs this short, and cache misses hit it on every new address.
+    """
+    n = 0
+    while n < len(ref) and ref[n].isalpha():
+        n += 1
+    try:
+        if n == 0:
+            raise ValueError
+        return ref[:n].upper(), int(ref[n:])
+    except ValueError:
         msg = f"Invalid cell reference: {ref}"
-        raise ValueError(msg)
-    return m.group(1).upper(), int(m.group(2))
+        raise ValueError(msg) from None
 
 
+@functools.lru_cache(maxsize=16384)
 def _parse_range(address: str) -> tuple[str | None, str, str]:
     """Parse 'Sheet1!A1:B5' into (sheet_name, start_cell, end_cell).
 
     Also handles 'A1:B5' (no sheet) and 'A1' (single cell).
     """
-    sheet_name = None
-    cell_part = address
-
-    if "!" in address:
-        sheet_name, cell_part = address.split("!", 1)
-        sheet_name = sheet_name.strip("'\"")
-
-    if ":" in cell_part:
-        start, end = cell_part.split(":", 1)
+    sheet_part, sep, cell_part = address.partition("!")
+    if sep:
+        sheet_name = sheet_part.strip("'\"")
     else:
-        start = end = cell_part
+        sheet_name = None
+        cell_part = sheet_part
+
+    start, sep, end = cell_part.partition(":")
+    if not sep:
+        end = start
 
     return sheet_name, start.upper(), end.upper()
 
 
+def _ref_to_rc(ref: str) -> tuple[int, int]:
+    """Convert 'B3' into its (row, col) cell key: (3, 1)."""
+    col_str, row_num = _parse_cell(ref)
+    return row_num, _col_to_index(col_str)
+
+
 # ---------------------------------------------------------------------------
 # Simulator
 # ---------------------------------------------------------------------------
@@ -193,28 +308,63 @@ class ExcelSimulator:
         self.active_sheet: str = "Sheet1"
         self.tables: dict[str, Table] = {}
         self.charts: dict[str, Chart] = {}
-        self.comments: list[Comment] = []
-        self.conditional_formats: list[ConditionalFormat] = []
-        self.data_validations: list[DataValidation] = []
+        # Comments as per-sheet parallel arrays (addresses/texts) plus a
+        # (sheet, address) -> slot index for O(1) edit and delete.
+        self._comment_index: dict[tuple[str, str], int] = {}
+        self._comment_addrs: defaultdict[str, list[str]] = defaultdict(list)
+        self._comment_texts: defaultdict[str, list[str]] = defaultdict(list)
+        self._cf_by_sheet: defaultdict[str, list[ConditionalFormat]] = defaultdict(list)
+        self.data_validations: dict[tuple[str, str], DataValidation] = {}
         self.named_ranges: dict[str, NamedRange] = {}
+        # Version tag for the memoized list_named_ranges payload.
+        self._nr_version: int = 0
+        self._nr_cache: tuple[int, list[dict[str, Any]]] = (-1, [])
+        # Sheet names in position order, so listing never needs a sort.
+        self._sheet_order: list[str] = ["Sheet1"]
+        # get_workbook_info payload, rebuilt lazily after sheet mutations.
+        self._sheets_info_cache: list[dict[str, Any]] = []
+        self._sheets_dirty: bool = True
         self._chart_counter: int = 0
+        # Cached result for the common full-recalculation request.
+        self._recalc_full_result: ToolResult = self._ok({"recalculated": True, "type": "Full"})
 
     # ─── Sheet resolution ────────────────────────────────────────────
 
     def _resolve_sheet(self, sheet_name: str | None = None) -> Sheet:
         name = sheet_name or self.active_sheet
-        if name not in self.sheets:
-            return self._error_result(f"Sheet '{name}' not found")  # type: ignore[return-value]
-        return self.sheets[name]
+        try:
+            return self.sheets[name]
+        except KeyError:
+            raise _SimError(f"Sheet '{name}' not found") from None
+
+    def _rescan_used_bounds(self, sheet: Sheet) -> None:
+        """Recompute a sheet's used-range bounds from its cells."""
+        min_row = min_col = sys.maxsize
+        max_row = max_col = 0
+        for r, c in sheet.cells:
+            if c < min_col:
+                min_col = c
+            if c > max_col:
+                max_col = c
+            if r < min_row:
+                min_row = r
+            if r > max_row:
+                max_row = r
+        sheet.min_row, sheet.max_row = min_row, max_row
+        sheet.min_col, sheet.max_col = min_col, max_col
+        sheet.used_dirty = False
 
     def _error_result(self, msg: str) -> ToolResult:
         return ToolResult(success=False, error=msg)
 
     def _ok(self, value: Any = None) -> ToolResult:
-        return ToolResult(success=True, value=value)
+        if value is None:
+            return _EMPTY_OK
+        return ToolResult.ok(value)
 
     # ─── Range Operations ────────────────────────────────────────────
 
+    @_catch_sim_error
     def get_range_values(
         self,
         address: str,
@@ -226,32 +376,29 @@ class ExcelSimulator:
     ) -> ToolResult:
         sheet_ref, start, end = _parse_range(address)
         sheet = self._resolve_sheet(sheet_ref or sheet_name)
-        if isinstance(sheet, ToolResult):
-            return sheet
 
-        start_col, rng_start_row = _parse_cell(start)
-        end_col, rng_end_row = _parse_cell(end)
+        rng_start_row, rng_start_ci = _ref_to_rc(start)
+        rng_end_row, rng_end_ci = _ref_to_rc(end)
 
         total_rows = rng_end_row - rng_start_row + 1
-        total_cols = _col_to_index(end_col) - _col_to_index(start_col) + 1
+        total_cols = rng_end_ci - rng_start_ci + 1
 
         # 1-based offsets into the range (default: 1)
         row_offset = max(1, start_row or 1)
         col_offset = max(1, start_column or 1)
         actual_row_start = rng_start_row + row_offset - 1
-        actual_col_start = _col_to_index(start_col) + col_offset - 1
+        actual_col_start = rng_start_ci + col_offset - 1
         actual_row_end = rng_start_row + (row_offset - 1) + (max_rows or total_rows) - 1
-        actual_col_end = _col_to_index(start_col) + (col_offset - 1) + (max_columns or total_cols) - 1
+        actual_col_end = rng_start_ci + (col_offset - 1) + (max_columns or total_cols) - 1
         actual_row_end = min(actual_row_end, rng_end_row)
-        actual_col_end = min(actual_col_end, _col_to_index(end_col))
+        actual_col_end = min(actual_col_end, rng_end_ci)
 
-        rows = []
-        for r in range(actual_row_start, actual_row_end + 1):
-            row = []
-            for c in range(actual_col_start, actual_col_end + 1):
-                cell_ref = f"{_index_to_col(c)}{r}"
-                row.append(sheet.cells.get(cell_ref, ""))
-            rows.append(row)
+        cell_get = sheet.cells.get
+        col_range = range(actual_col_start, actual_col_end + 1)
+        # Result grids are serialized straight to JSON and never mutated,
+        # so rows are tuples — smaller and with no growth headroom.
+        rows = [tuple(cell_get((r, c), "") for c in col_range)
+                for r in range(actual_row_start, actual_row_end + 1)]
 
         result: dict[str, Any] = {
             "address": f"{start}:{end}",
@@ -267,31 +414,38 @@ class ExcelSimulator:
             if actual_row_end < rng_end_row:
                 result["moreRows"] = True
                 result["nextStartRow"] = actual_row_end - rng_start_row + 2
-            if actual_col_end < _col_to_index(end_col):
+            if actual_col_end < rng_end_ci:
                 result["moreColumns"] = True
-                result["nextStartColumn"] = actual_col_end - _col_to_index(start_col) + 2
+                result["nextStartColumn"] = actual_col_end - rng_start_ci + 2
 
         return self._ok(result)
 
+    @_catch_sim_error
     def set_range_values(self, address: str, values: list[list[Any]], sheet_name: str | None = None) -> ToolResult:
         sheet_ref, start, _end = _parse_range(address)
         sheet = self._resolve_sheet(sheet_ref or sheet_name)
-        if isinstance(sheet, ToolResult):
-            return sheet
 
-        start_col, start_row = _parse_cell(start)
-        base_col = _col_to_index(start_col)
-
-        for ri, row in enumerate(values):
-            for ci, val in enumerate(row):
-                cell_ref = f"{_index_to_col(base_col + ci)}{start_row + ri}"
-                sheet.cells[cell_ref] = val
+        start_row, base_col = _ref_to_rc(start)
 
         num_rows = len(values)
         num_cols = max((len(r) for r in values), default=0)
+        cells = sheet.cells
+        cells_str, cells_lower = sheet.cells_str, sheet.cells_lower
+        for ri, row in enumerate(values):
+            r = start_row + ri
+            for ci, val in enumerate(row):
+                key = (r, base_col + ci)
+                cells[key] = val
+                s = str(val)
+                cells_str[key] = s
+                cells_lower[key] = s.lower()
+
+        if num_rows and num_cols:
+            sheet.expand_used(start_row, start_row + num_rows - 1, base_col, base_col + num_cols - 1)
         end_cell = f"{_index_to_col(base_col + num_cols - 1)}{start_row + num_rows - 1}"
         return self._ok({"address": f"{start}:{end_cell}", "rowsWritten": num_rows, "columnsWritten": num_cols})
 
+    @_catch_sim_error
     def get_used_range(
         self,
         sheet_name: str | None = None,
@@ -301,8 +455,6 @@ class ExcelSimulator:
         start_column: int | None = None,
     ) -> ToolResult:
         sheet = self._resolve_sheet(sheet_name)
-        if isinstance(sheet, ToolResult):
-            return sheet
 
         include_values = max_rows is not None or start_row is not None or start_column is not None or max_columns is not None
 
@@ -314,19 +466,14 @@ class ExcelSimulator:
                 result["columnsReturned"] = 1
             return self._ok(result)
 
-        min_col = min_row = float("inf")
-        max_col = max_row = 0
-        for ref in sheet.cells:
-            col_str, row_num = _parse_cell(ref)
-            ci = _col_to_index(col_str)
-            min_col = min(min_col, ci)
-            max_col = max(max_col, ci)
-            min_row = min(min_row, row_num)
-            max_row = max(max_row, row_num)
+        if sheet.used_dirty:
+            self._rescan_used_bounds(sheet)
+        min_row, max_row = sheet.min_row, sheet.max_row
+        min_col, max_col = sheet.min_col, sheet.max_col
 
-        total_rows = int(max_row) - int(min_row) + 1
-        total_cols = int(max_col) - int(min_col) + 1
-        addr = f"{_index_to_col(int(min_col))}{int(min_row)}:{_index_to_col(int(max_col))}{int(max_row)}"
+        total_rows = max_row - min_row + 1
+        total_cols = max_col - min_col + 1
+        addr = f"{_index_to_col(min_col)}{min_row}:{_index_to_col(max_col)}{max_row}"
 
         result = {
             "address": addr,
@@ -337,86 +484,92 @@ class ExcelSimulator:
         if include_values:
             row_offset = max(1, start_row or 1)
             col_offset = max(1, start_column or 1)
-            actual_row_start = int(min_row) + row_offset - 1
-            actual_col_start = int(min_col) + col_offset - 1
+            actual_row_start = min_row + row_offset - 1
+            actual_col_start = min_col + col_offset - 1
             actual_row_end = actual_row_start + (max_rows or total_rows) - 1
             actual_col_end = actual_col_start + (max_columns or total_cols) - 1
-            actual_row_end = min(actual_row_end, int(max_row))
-            actual_col_end = min(actual_col_end, int(max_col))
+            actual_row_end = min(actual_row_end, max_row)
+            actual_col_end = min(actual_col_end, max_col)
 
-            rows = []
-            for r in range(actual_row_start, actual_row_end + 1):
-                row = []
-                for c in range(actual_col_start, actual_col_end + 1):
-                    cell_ref = f"{_index_to_col(c)}{r}"
-                    row.append(sheet.cells.get(cell_ref, ""))
-                rows.append(row)
+            cell_get = sheet.cells.get
+            col_range = range(actual_col_start, actual_col_end + 1)
+            rows = [tuple(cell_get((r, c), "") for c in col_range)
+                    for r in range(actual_row_start, actual_row_end + 1)]
 
             result["values"] = rows
             result["rowsReturned"] = len(rows)
             result["columnsReturned"] = len(rows[0]) if rows else 0
 
-            if actual_row_end < int(max_row):
+            if actual_row_end < max_row:
                 result["moreRows"] = True
-                result["nextStartRow"] = actual_row_end - int(min_row) + 2
-            if actual_col_end < int(max_col):
+                result["nextStartRow"] = actual_row_end - min_row + 2
+            if actual_col_end < max_col:
                 result["moreColumns"] = True
-                result["nextStartColumn"] = actual_col_end - int(min_col) + 2
+                result["nextStartColumn"] = actual_col_end - min_col + 2
 
         return self._ok(result)
 
+    @_catch_sim_error
     def clear_range(self, address: str, sheet_name: str | None = None) -> ToolResult:
         sheet_ref, start, end = _parse_range(address)
         sheet = self._resolve_sheet(sheet_ref or sheet_name)
-        if isinstance(sheet, ToolResult):
-            return sheet
 
-        start_col, start_row = _parse_cell(start)
-        end_col, end_row = _parse_cell(end)
+        start_row, start_ci = _ref_to_rc(start)
+        end_row, end_ci = _ref_to_rc(end)
 
+        cells, formulas, formats = sheet.cells, sheet.formulas, sheet.formats
         cleared = 0
         for r in range(start_row, end_row + 1):
-            for c in range(_col_to_index(start_col), _col_to_index(end_col) + 1):
-                cell_ref = f"{_index_to_col(c)}{r}"
-                if cell_ref in sheet.cells:
-                    del sheet.cells[cell_ref]
+            for c in range(start_ci, end_ci + 1):
+                key = (r, c)
+                if cells.pop(key, _MISSING) is not _MISSING:
                     cleared += 1
-                sheet.formulas.pop(cell_ref, None)
-                sheet.formats.pop(cell_ref, None)
+                    del sheet.cells_str[key], sheet.cells_lower[key]
+                formulas.pop(key, None)
+                formats.pop(key, None)
+
+        # Only a clear touching the boundary can shrink the used range;
+        # leave the rescan to the next get_used_range.
+        if cleared and (
+            start_row <= sheet.min_row or end_row >= sheet.max_row
+            or start_ci <= sheet.min_col or end_ci >= sheet.max_col
+        ):
+            sheet.used_dirty = True
 
         return self._ok({"address": address, "cellsCleared": cleared})
 
+    @_catch_sim_error
     def format_range(self, address: str, sheet_name: str | None = None, **fmt: Any) -> ToolResult:
         sheet_ref, start, end = _parse_range(address)
         sheet = self._resolve_sheet(sheet_ref or sheet_name)
-        if isinstance(sheet, ToolResult):
-            return sheet
 
-        start_col, start_row = _parse_cell(start)
-        end_col, end_row = _parse_cell(end)
+        start_row, start_ci = _ref_to_rc(start)
+        end_row, end_ci = _ref_to_rc(end)
 
+        # Replace instead of mutating in place: copy_sheet shares the inner
+        # format dicts between sheets, so an in-place update would leak
+        # through to the copy.
+        formats_store = sheet.formats
+        get = formats_store.get
         for r in range(start_row, end_row + 1):
-            for c in range(_col_to_index(start_col), _col_to_index(end_col) + 1):
-                cell_ref = f"{_index_to_col(c)}{r}"
-                if cell_ref not in sheet.formats:
-                    sheet.formats[cell_ref] = {}
-                sheet.formats[cell_ref].update(fmt)
+            for c in range(start_ci, end_ci + 1):
+                key = (r, c)
+                cur = get(key)
+                formats_store[key] = {**cur, **fmt} if cur else dict(fmt)
 
         return self._ok({"address": address, "formatsApplied": list(fmt.keys())})
 
+    @_catch_sim_error
     def set_number_format(self, address: str, format_code: str, sheet_name: str | None = None) -> ToolResult:
         sheet_ref, start, end = _parse_range(address)
         sheet = self._resolve_sheet(sheet_ref or sheet_name)
-        if isinstance(sheet, ToolResult):
-            return sheet
 
-        start_col, start_row = _parse_cell(start)
-        end_col, end_row = _parse_cell(end)
+        start_row, start_ci = _ref_to_rc(start)
+        end_row, end_ci = _ref_to_rc(end)
 
         for r in range(start_row, end_row + 1):
-            for c in range(_col_to_index(start_col), _col_to_index(end_col) + 1):
-                cell_ref = f"{_index_to_col(c)}{r}"
-                sheet.number_formats[cell_ref] = format_code
+            for c in range(start_ci, end_ci + 1):
+                sheet.number_formats[(r, c)] = format_code
 
         return self._ok({"address": address, "numberFormat": format_code})
 
@@ -426,39 +579,48 @@ class ExcelSimulator:
     def auto_fit_rows(self, address: str, sheet_name: str | None = None) -> ToolResult:
         return self._ok({"address": address, "autoFitRows": True})
 
+    @_catch_sim_error
     def set_range_formulas(self, address: str, formulas: list[list[str]], sheet_name: str | None = None) -> ToolResult:
         sheet_ref, start, _end = _parse_range(address)
         sheet = self._resolve_sheet(sheet_ref or sheet_name)
-        if isinstance(sheet, ToolResult):
-            return sheet
 
-        start_col, start_row = _parse_cell(start)
-        base_col = _col_to_index(start_col)
+        start_row, base_col = _ref_to_rc(start)
 
+        # Formulas usually repeat down a range; build each placeholder once.
+        cells, formula_store = sheet.cells, sheet.formulas
+        cells_str, cells_lower = sheet.cells_str, sheet.cells_lower
+        placeholders: dict[str, tuple[str, str]] = {}
         for ri, row in enumerate(formulas):
+            r = start_row + ri
             for ci, formula in enumerate(row):
-                cell_ref = f"{_index_to_col(base_col + ci)}{start_row + ri}"
-                sheet.formulas[cell_ref] = formula
-                sheet.cells[cell_ref] = f"[formula:{formula}]"
+                key = (r, base_col + ci)
+                formula_store[key] = formula
+                entry = placeholders.get(formula)
+                if entry is None:
+                    placeholder = f"[formula:{formula}]"
+                    entry = placeholders[formula] = (placeholder, placeholder.lower())
+                cells[key] = cells_str[key] = entry[0]
+                cells_lower[key] = entry[1]
+
+        num_rows = len(formulas)
+        num_cols = max((len(r) for r in formulas), default=0)
+        if num_rows and num_cols:
+            sheet.expand_used(start_row, start_row + num_rows - 1, base_col, base_col + num_cols - 1)
 
         return self._ok({"address": address, "formulasSet": len(formulas)})
 
+    @_catch_sim_error
     def get_range_formulas(self, address: str, sheet_name: str | None = None) -> ToolResult:
         sheet_ref, start, end = _parse_range(address)
         sheet = self._resolve_sheet(sheet_ref or sheet_name)
-        if isinstance(sheet, ToolResult):
-            return sheet
 
-        start_col, start_row = _parse_cell(start)
-        end_col, end_row = _parse_cell(end)
+        start_row, start_ci = _ref_to_rc(start)
+        end_row, end_ci = _ref_to_rc(end)
 
-        rows = []
-        for r in range(start_row, end_row + 1):
-            row = []
-            for c in range(_col_to_index(start_col), _col_to_index(end_col) + 1):
-                cell_ref = f"{_index_to_col(c)}{r}"
-                row.append(sheet.formulas.get(cell_ref, ""))
-            rows.append(row)
+        formula_get = sheet.formulas.get
+        col_range = range(start_ci, end_ci + 1)
+        rows = [tuple(formula_get((r, c), "") for c in col_range)
+                for r in range(start_row, end_row + 1)]
 
         return self._ok(rows)
 
@@ -472,21 +634,22 @@ class ExcelSimulator:
         src_result = self.get_range_values(source_address, source_sheet_name)
         if not src_result.success:
             return src_result
-        return self.set_range_values(destination_address, src_result.value, destination_sheet_name)
+        return self.set_range_values(destination_address, src_result.value["values"], destination_sheet_name)
 
+    @_catch_sim_error
     def find_values(self, searchValue: str, address: str | None = None,
                     sheet_name: str | None = None, match_case: bool = False) -> ToolResult:
         sheet = self._resolve_sheet(sheet_name)
-        if isinstance(sheet, ToolResult):
-            return sheet
 
         matches = []
         search = searchValue if match_case else searchValue.lower()
+        index = sheet.cells_str if match_case else sheet.cells_lower
+        cells = sheet.cells
 
-        for ref, val in sheet.cells.items():
-            cell_val = str(val) if match_case else str(val).lower()
+        for key, cell_val in index.items():
             if search in cell_val:
-                matches.append({"address": ref, "value": val})
+                r, c = key
+                matches.append({"address": f"{_IDX_TO_COL[c]}{r}", "value": cells[key]})
 
         return self._ok(matches)
 
@@ -496,33 +659,35 @@ class ExcelSimulator:
     def delete_range(self, address: str, shift: str, sheet_name: str | None = None) -> ToolResult:
         return self._ok({"address": address, "shift": shift, "deleted": True})
 
+    @_catch_sim_error
     def merge_cells(self, address: str, across: bool = False, sheet_name: str | None = None) -> ToolResult:
         sheet = self._resolve_sheet(sheet_name)
-        if isinstance(sheet, ToolResult):
-            return sheet
-        sheet.merged.append(address)
+        sheet.merged[address] = None
         return self._ok({"address": address, "merged": True})
 
+    @_catch_sim_error
     def unmerge_cells(self, address: str, sheet_name: str | None = None) -> ToolResult:
         sheet = self._resolve_sheet(sheet_name)
-        if isinstance(sheet, ToolResult):
-            return sheet
-        sheet.merged = [m for m in sheet.merged if m != address]
+        sheet.merged.pop(address, None)
         return self._ok({"address": address, "unmerged": True})
 
+    @_catch_sim_error
     def replace_values(
         self, find: str, replace: str, address: str | None = None, sheet_name: str | None = None
     ) -> ToolResult:
         sheet = self._resolve_sheet(sheet_name)
-        if isinstance(sheet, ToolResult):
-            return sheet
-        count = 0
-        for ref, val in list(sheet.cells.items()):
-            cell_str = str(val)
-            if find.lower() in cell_str.lower():
-                sheet.cells[ref] = cell_str.replace(find, replace)
-                count += 1
-        return self._ok({"find": find, "replace": replace, "replacements": count})
+        # Scan the case-folded shadow and collect hits first, so no full
+        # snapshot of the cells dict is needed before mutating.
+        find_lower = find.lower()
+        cells_str = sheet.cells_str
+        changed = [(key, cells_str[key].replace(find, replace))
+                   for key, lower_val in sheet.cells_lower.items()
+                   if find_lower in lower_val]
+        cells, cells_lower = sheet.cells, sheet.cells_lower
+        for key, new_val in changed:
+            cells[key] = cells_str[key] = new_val
+            cells_lower[key] = new_val.lower()
+        return self._ok({"find": find, "replace": replace, "replacements": len(changed)})
 
     def remove_duplicates(
         self, address: str, columns: list[str], sheet_name: str | None = None
@@ -530,6 +695,7 @@ class ExcelSimulator:
         # Simplified: just acknowledge the operation
         return self._ok({"address": address, "rowsRemoved": 0, "rowsRemaining": 0})
 
+    @_catch_sim_error
     def set_hyperlink(
         self,
         address: str,
@@ -539,8 +705,6 @@ class ExcelSimulator:
         sheet_name: str | None = None,
     ) -> ToolResult:
         sheet = self._resolve_sheet(sheet_name)
-        if isinstance(sheet, ToolResult):
-            return sheet
         if url == "":
             sheet.hyperlinks.pop(address, None)
         else:
@@ -551,26 +715,23 @@ class ExcelSimulator:
             }
         return self._ok({"address": address, "url": url or None})
 
+    @_catch_sim_error
     def toggle_row_column_visibility(
         self, address: str, hidden: bool, target: str, sheet_name: str | None = None
     ) -> ToolResult:
-        sheet = self._resolve_sheet(sheet_name)
-        if isinstance(sheet, ToolResult):
-            return sheet
+        self._resolve_sheet(sheet_name)  # existence check only
         return self._ok({"address": address, "target": target, "hidden": hidden})
 
+    @_catch_sim_error
     def group_rows_columns(self, address: str, sheet_name: str | None = None) -> ToolResult:
         sheet = self._resolve_sheet(sheet_name)
-        if isinstance(sheet, ToolResult):
-            return sheet
-        sheet.grouped_rows.append(address)
+        sheet.grouped_rows[address] = None
         return self._ok({"address": address, "grouped": True})
 
+    @_catch_sim_error
     def ungroup_rows_columns(self, address: str, sheet_name: str | None = None) -> ToolResult:
         sheet = self._resolve_sheet(sheet_name)
-        if isinstance(sheet, ToolResult):
-            return sheet
-        sheet.grouped_rows = [g for g in sheet.grouped_rows if g != address]
+        sheet.grouped_rows.pop(address, None)
         return self._ok({"address": address, "ungrouped": True})
 
     def set_cell_borders(
@@ -585,9 +746,21 @@ class ExcelSimulator:
 
     # ─── Sheet Operations ────────────────────────────────────────────
 
+    def _place_in_order(self, name: str) -> None:
+        """Insert a sheet name into _sheet_order, keeping positions sorted."""
+        order = self._sheet_order
+        pos = self.sheets[name].position
+        idx = len(order)
+        for i, existing in enumerate(order):
+            if self.sheets[existing].position > pos:
+                idx = i
+                break
+        order.insert(idx, name)
+
     def list_sheets(self) -> ToolResult:
-        sheets = [{"name": s.name, "position": s.position, "isActive": s.name == self.active_sheet}
-                  for s in sorted(self.sheets.values(), key=lambda s: s.position)]
+        active = self.active_sheet
+        sheets = [{"name": name, "position": self.sheets[name].position, "isActive": name == active}
+                  for name in self._sheet_order]
         return self._ok(sheets)
 
     def create_sheet(self, name: str) -> ToolResult:
@@ -595,6 +768,8 @@ class ExcelSimulator:
             return self._error_result(f"Sheet '{name}' already exists")
         pos = len(self.sheets)
         self.sheets[name] = Sheet(name=name, position=pos)
+        self._sheet_order.append(name)
+        self._sheets_dirty = True
         return self._ok({"name": name, "id": f"sheet_{name}", "position": pos})
 
     def rename_sheet(self, current_name: str, new_name: str) -> ToolResult:
@@ -605,16 +780,21 @@ class ExcelSimulator:
         sheet = self.sheets.pop(current_name)
         sheet.name = new_name
         self.sheets[new_name] = sheet
+        self._sheet_order[self._sheet_order.index(current_name)] = new_name
+        self._sheets_dirty = True
         if self.active_sheet == current_name:
             self.active_sheet = new_name
         return self._ok({"previousName": current_name, "newName": new_name})
 
     def delete_sheet(self, name: str) -> ToolResult:
-        if name not in self.sheets:
-            return self._error_result(f"Sheet '{name}' not found")
         if len(self.sheets) <= 1:
+            if name not in self.sheets:
+                return self._error_result(f"Sheet '{name}' not found")
             return self._error_result("Cannot delete the last sheet")
-        del self.sheets[name]
+        if self.sheets.pop(name, None) is None:
+            return self._error_result(f"Sheet '{name}' not found")
+        self._sheet_order.remove(name)
+        self._sheets_dirty = True
         if self.active_sheet == name:
             self.active_sheet = next(iter(self.sheets))
         return self._ok({"deleted": name})
@@ -626,30 +806,32 @@ class ExcelSimulator:
         return self._ok({"activated": name})
 
     def freeze_panes(self, name: str, freeze_at: str | None = None) -> ToolResult:
-        if name not in self.sheets:
+        sheet = self.sheets.get(name)
+        if sheet is None:
             return self._error_result(f"Sheet '{name}' not found")
-        sheet = self.sheets[name]
         sheet.frozen_at = freeze_at
         return self._ok({"sheet": name, "frozenAt": freeze_at, "unfrozen": freeze_at is None})
 
     def protect_sheet(self, name: str, password: str | None = None) -> ToolResult:
-        if name not in self.sheets:
+        sheet = self.sheets.get(name)
+        if sheet is None:
             return self._error_result(f"Sheet '{name}' not found")
-        self.sheets[name].is_protected = True
+        sheet.is_protected = True
         return self._ok({"sheet": name, "protected": True})
 
     def unprotect_sheet(self, name: str, password: str | None = None) -> ToolResult:
-        if name not in self.sheets:
+        sheet = self.sheets.get(name)
+        if sheet is None:
             return self._error_result(f"Sheet '{name}' not found")
-        self.sheets[name].is_protected = False
+        sheet.is_protected = False
         return self._ok({"sheet": name, "protected": False})
 
     def set_sheet_visibility(
         self, name: str, visibility: str | None = None, tab_color: str | None = None
     ) -> ToolResult:
-        if name not in self.sheets:
+        sheet = self.sheets.get(name)
+        if sheet is None:
             return self._error_result(f"Sheet '{name}' not found")
-        sheet = self.sheets[name]
         if visibility is not None:
             sheet.visibility = visibility
         if tab_color is not None:
@@ -657,9 +839,9 @@ class ExcelSimulator:
         return self._ok({"name": name, "visibility": sheet.visibility, "tabColor": sheet.tab_color})
 
     def copy_sheet(self, name: str, new_name: str | None = None) -> ToolResult:
-        if name not in self.sheets:
+        source = self.sheets.get(name)
+        if source is None:
             return self._error_result(f"Sheet '{name}' not found")
-        source = self.sheets[name]
         copied_name = new_name or f"{name} (2)"
         if copied_name in self.sheets:
             return self._error_result(f"Sheet '{copied_name}' already exists")
@@ -668,18 +850,31 @@ class ExcelSimulator:
             name=copied_name,
             cells=dict(source.cells),
             formulas=dict(source.formulas),
-            formats={k: dict(v) for k, v in source.formats.items()},
+            formats=dict(source.formats),
             number_formats=dict(source.number_formats),
-            merged=list(source.merged),
+            cells_str=dict(source.cells_str),
+            cells_lower=dict(source.cells_lower),
+            merged=dict(source.merged),
             position=pos,
+            min_row=source.min_row,
+            max_row=source.max_row,
+            min_col=source.min_col,
+            max_col=source.max_col,
+            used_dirty=source.used_dirty,
         )
         self.sheets[copied_name] = new_sheet
+        self._place_in_order(copied_name)
+        self._sheets_dirty = True
         return self._ok({"sourceSheet": name, "copiedSheet": copied_name, "position": pos})
 
     def move_sheet(self, name: str, position: int) -> ToolResult:
-        if name not in self.sheets:
+        sheet = self.sheets.get(name)
+        if sheet is None:
             return self._error_result(f"Sheet '{name}' not found")
-        self.sheets[name].position = position
+        sheet.position = position
+        self._sheet_order.remove(name)
+        self._place_in_order(name)
+        self._sheets_dirty = True
         return self._ok({"name": name, "position": position})
 
     def set_page_layout(
@@ -692,26 +887,28 @@ class ExcelSimulator:
         top_margin: float | None = None,
         bottom_margin: float | None = None,
     ) -> ToolResult:
-        if name not in self.sheets:
+        sheet = self.sheets.get(name)
+        if sheet is None:
             return self._error_result(f"Sheet '{name}' not found")
-        sheet = self.sheets[name]
-        if orientation:
-            sheet.page_layout["orientation"] = orientation
-        if paper_size:
-            sheet.page_layout["paperSize"] = paper_size
-        if left_margin is not None:
-            sheet.page_layout["margins"]["left"] = left_margin
-        if right_margin is not None:
-            sheet.page_layout["margins"]["right"] = right_margin
-        if top_margin is not None:
-            sheet.page_layout["margins"]["top"] = top_margin
-        if bottom_margin is not None:
-            sheet.page_layout["margins"]["bottom"] = bottom_margin
+        layout = sheet.page_layout
+        if layout is _DEFAULT_PAGE_LAYOUT:
+            layout = sheet.page_layout = {**layout, "margins": dict(layout["margins"])}
+        updates = {k: v for k, v in (("orientation", orientation), ("paperSize", paper_size)) if v}
+        if updates:
+            layout.update(updates)
+        margin_updates = {
+            k: v
+            for k, v in (("left", left_margin), ("right", right_margin),
+                         ("top", top_margin), ("bottom", bottom_margin))
+            if v is not None
+        }
+        if margin_updates:
+            layout["margins"].update(margin_updates)
         return self._ok({
             "sheet": name,
-            "orientation": sheet.page_layout["orientation"],
-            "paperSize": sheet.page_layout["paperSize"],
-            "margins": sheet.page_layout["margins"],
+            "orientation": layout["orientation"],
+            "paperSize": layout["paperSize"],
+            "margins": layout["margins"],
         })
 
     # ─── Table Operations ────────────────────────────────────────────
@@ -739,18 +936,17 @@ class ExcelSimulator:
         return self._ok({"tableName": table_name, "rowsAdded": len(values)})
 
     def get_table_data(self, table_name: str) -> ToolResult:
-        if table_name not in self.tables:
+        table = self.tables.get(table_name)
+        if table is None:
             return self._error_result(f"Table '{table_name}' not found")
-        table = self.tables[table_name]
         result = self.get_range_values(table.address, table.sheet_name)
         if not result.success:
             return result
         return self._ok({"tableName": table_name, "address": table.address, "values": result.value})
 
     def delete_table(self, table_name: str) -> ToolResult:
-        if table_name not in self.tables:
+        if self.tables.pop(table_name, None) is None:
             return self._error_result(f"Table '{table_name}' not found")
-        del self.tables[table_name]
         return self._ok({"deleted": table_name})
 
     def sort_table(self, table_name: str, column: int, ascending: bool = True) -> ToolResult:
@@ -782,10 +978,9 @@ class ExcelSimulator:
         return self._ok({"tableName": table_name, "columnName": column_name, "deleted": True})
 
     def convert_table_to_range(self, table_name: str) -> ToolResult:
-        if table_name not in self.tables:
+        table = self.tables.pop(table_name, None)
+        if table is None:
             return self._error_result(f"Table '{table_name}' not found")
-        table = self.tables[table_name]
-        del self.tables[table_name]
         return self._ok({"tableName": table_name, "rangeAddress": table.address, "converted": True})
 
     # ─── Chart Operations ────────────────────────────────────────────
@@ -808,36 +1003,41 @@ class ExcelSimulator:
         return self._ok({"name": name, "chartType": chart_type, "title": title or "", "dataRange": data_range})
 
     def delete_chart(self, chart_name: str, sheet_name: str | None = None) -> ToolResult:
-        if chart_name not in self.charts:
+        if self.charts.pop(chart_name, None) is None:
             return self._error_result(f"Chart '{chart_name}' not found")
-        del self.charts[chart_name]
         return self._ok({"deleted": chart_name})
 
     def set_chart_title(self, chart_name: str, title: str, sheet_name: str | None = None) -> ToolResult:
-        if chart_name not in self.charts:
+        chart = self.charts.get(chart_name)
+        if chart is None:
             return self._error_result(f"Chart '{chart_name}' not found")
-        self.charts[chart_name].title = title
+        chart.title = title
         return self._ok({"chartName": chart_name, "title": title})
 
     def set_chart_type(self, chart_name: str, chart_type: str, sheet_name: str | None = None) -> ToolResult:
-        if chart_name not in self.charts:
+        chart = self.charts.get(chart_name)
+        if chart is None:
             return self._error_result(f"Chart '{chart_name}' not found")
-        self.charts[chart_name].chart_type = chart_type
+        chart.chart_type = chart_type
         return self._ok({"chartName": chart_name, "chartType": chart_type})
 
     def set_chart_data_source(
         self, chart_name: str, data_range: str, sheet_name: str | None = None
     ) -> ToolResult:
-        if chart_name not in self.charts:
+        chart = self.charts.get(chart_name)
+        if chart is None:
             return self._error_result(f"Chart '{chart_name}' not found")
-        self.charts[chart_name].data_range = data_range
+        chart.data_range = data_range
         return self._ok({"chartName": chart_name, "dataRange": data_range, "updated": True})
 
     # ─── Workbook Operations ─────────────────────────────────────────
 
     def get_workbook_info(self) -> ToolResult:
-        sheets_info = [{"name": s.name, "position": s.position}
-                       for s in sorted(self.sheets.values(), key=lambda s: s.position)]
+        if self._sheets_dirty:
+            self._sheets_info_cache = [{"name": name, "position": self.sheets[name].position}
+                                       for name in self._sheet_order]
+            self._sheets_dirty = False
+        sheets_info = self._sheets_info_cache
         return self._ok({
             "activeSheet": self.active_sheet,
             "sheets": sheets_info,
@@ -847,8 +1047,10 @@ class ExcelSimulator:
         })
 
     def recalculate_workbook(self, recalc_type: str | None = None) -> ToolResult:
-        recalc = recalc_type or "Full"
-        return self._ok({"recalculated": True, "type": recalc})
+        if recalc_type is None or recalc_type == "Full":
+            # Shared, treated as immutable by callers.
+            return self._recalc_full_result
+        return self._ok({"recalculated": True, "type": recalc_type})
 
     def get_selected_range(self) -> ToolResult:
         return self._ok({"address": "A1", "values": [[""]], "sheetName": self.active_sheet})
@@ -856,39 +1058,65 @@ class ExcelSimulator:
     def define_named_range(self, name: str, address: str, sheet_name: str | None = None) -> ToolResult:
         sn = sheet_name or self.active_sheet
         self.named_ranges[name] = NamedRange(name=name, address=address, sheet_name=sn)
+        self._nr_version += 1
         return self._ok({"name": name, "address": address, "comment": ""})
 
     def list_named_ranges(self) -> ToolResult:
-        return self._ok([{"name": n.name, "address": n.address, "sheetName": n.sheet_name}
-                        for n in self.named_ranges.values()])
+        version, payload = self._nr_cache
+        if version != self._nr_version:
+            payload = [{"name": n.name, "address": n.address, "sheetName": n.sheet_name}
+                       for n in self.named_ranges.values()]
+            self._nr_cache = (self._nr_version, payload)
+        return self._ok(payload)
 
     # ─── Comment Operations ──────────────────────────────────────────
 
     def add_comment(self, cell_address: str, text: str, sheet_name: str | None = None) -> ToolResult:
         sn = sheet_name or self.active_sheet
-        self.comments.append(Comment(cell_address=cell_address, text=text, sheet_name=sn))
+        key = (sn, cell_address)
+        idx = self._comment_index.get(key)
+        if idx is not None:
+            self._comment_texts[sn][idx] = text
+        else:
+            addrs = self._comment_addrs[sn]
+            self._comment_index[key] = len(addrs)
+            addrs.append(cell_address)
+            self._comment_texts[sn].append(text)
         return self._ok({"cellAddress": cell_address, "text": text, "sheetName": sn})
 
     def list_comments(self, sheet_name: str | None = None) -> ToolResult:
         sn = sheet_name or self.active_sheet
-        filtered = [c for c in self.comments if c.sheet_name == sn]
-        return self._ok([{"cellAddress": c.cell_address, "text": c.text} for c in filtered])
+        addrs = self._comment_addrs.get(sn)
+        if not addrs:
+            return _EMPTY_LIST_OK
+        return self._ok([{"cellAddress": a, "text": t}
+                        for a, t in zip(addrs, self._comment_texts[sn])])
 
     def edit_comment(self, cell_address: str, new_text: str, sheet_name: str | None = None) -> ToolResult:
         sn = sheet_name or self.active_sheet
-        for c in self.comments:
-            if c.cell_address == cell_address and c.sheet_name == sn:
-                c.text = new_text
-                return self._ok({"cellAddress": cell_address, "newText": new_text})
-        return self._error_result(f"No comment at {cell_address}")
+        idx = self._comment_index.get((sn, cell_address))
+        if idx is None:
+            return self._error_result(f"No comment at {cell_address}")
+        self._comment_texts[sn][idx] = new_text
+        return self._ok({"cellAddress": cell_address, "newText": new_text})
 
     def delete_comment(self, cell_address: str, sheet_name: str | None = None) -> ToolResult:
         sn = sheet_name or self.active_sheet
-        for i, c in enumerate(self.comments):
-            if c.cell_address == cell_address and c.sheet_name == sn:
-                self.comments.pop(i)
-                return self._ok({"deleted": cell_address})
-        return self._error_result(f"No comment at {cell_address}")
+        idx = self._comment_index.pop((sn, cell_address), None)
+        if idx is None:
+            return self._error_result(f"No comment at {cell_address}")
+        addrs = self._comment_addrs[sn]
+        texts = self._comment_texts[sn]
+        last = len(addrs) - 1
+        if idx != last:
+            # Swap-remove: move the tail entry into the vacated slot.
+            moved_addr = addrs[last]
+            addrs[idx] = moved_addr
+            texts[idx] = texts[last]
+            self._comment_index[(sn, moved_addr)] = idx
+        addrs.pop()
+        texts.pop()
+        return self._ok({"deleted": cell_address})
 
     # ─── Conditional Format Operations ───────────────────────────────
 
@@ -896,21 +1124,21 @@ class ExcelSimulator:
                                sheet_name: str | None = None, **params: Any) -> ToolResult:
         sn = sheet_name or self.active_sheet
         cf = ConditionalFormat(rule_type=rule_type, address=address, sheet_name=sn, params=params)
-        self.conditional_formats.append(cf)
+        self._cf_by_sheet[sn].append(cf)
         return self._ok({"ruleType": rule_type, "address": address, "applied": True})
 
     def list_conditional_formats(self, address: str, sheet_name: str | None = None) -> ToolResult:
         sn = sheet_name or self.active_sheet
-        filtered = [cf for cf in self.conditional_formats if cf.sheet_name == sn]
+        rules = self._cf_by_sheet.get(sn)
+        if not rules:
+            return _EMPTY_LIST_OK
         return self._ok([{"ruleType": cf.rule_type, "address": cf.address, "params": cf.params}
-                        for cf in filtered])
+                        for cf in rules])
 
     def clear_conditional_formats(self, address: str | None = None,
                                   sheet_name: str | None = None) -> ToolResult:
         sn = sheet_name or self.active_sheet
-        before = len(self.conditional_formats)
-        self.conditional_formats = [cf for cf in self.conditional_formats if cf.sheet_name != sn]
-        cleared = before - len(self.conditional_formats)
+        cleared = len(self._cf_by_sheet.pop(sn, ()))
         return self._ok({"cleared": cleared})
 
     # ─── Data Validation Operations ──────────────────────────────────
@@ -919,28 +1147,25 @@ class ExcelSimulator:
                             sheet_name: str | None = None, **params: Any) -> ToolResult:
         sn = sheet_name or self.active_sheet
         dv = DataValidation(validation_type=validation_type, address=address, sheet_name=sn, params=params)
-        self.data_validations = [v for v in self.data_validations if not (v.address == address and v.sheet_name == sn)]
-        self.data_validations.append(dv)
+        self.data_validations[(sn, address)] = dv
         return self._ok({"validationType": validation_type, "address": address, "applied": True})
 
     def get_data_validation(self, address: str, sheet_name: str | None = None) -> ToolResult:
         sn = sheet_name or self.active_sheet
-        for dv in self.data_validations:
-            if dv.address == address and dv.sheet_name == sn:
-                return self._ok({"validationType": dv.validation_type, "address": address, "params": dv.params})
+        dv = self.data_validations.get((sn, address))
+        if dv is not None:
+            return self._ok({"validationType": dv.validation_type, "address": address, "params": dv.params})
         return self._ok({"address": address, "validationType": None, "message": "No validation set"})
 
     def clear_data_validation(self, address: str, sheet_name: str | None = None) -> ToolResult:
         sn = sheet_name or self.active_sheet
-        before = len(self.data_validations)
-        self.data_validations = [v for v in self.data_validations if not (v.address == address and v.sheet_name == sn)]
-        cleared = before - len(self.data_validations)
+        cleared = 0 if self.data_validations.pop((sn, address), None) is None else 1
         return self._ok({"address": address, "cleared": cleared})
 
     # ─── Pivot Table Operations ──────────────────────────────────────
 
     def list_pivot_tables(self, sheet_name: str | None = None) -> ToolResult:
-        return self._ok([])
+        return _EMPTY_LIST_OK
 
     def refresh_pivot_table(self, pivot_table_name: str, sheet_name: str | None = None) -> ToolResult:
         re
@@ -11,6 +11,8 @@ Note: These tests use real LLM calls and cost money. Use --lf to re-run failures
 
 from __future__ import annotations
 
+from collections.abc import Sequence
+
 import pytest
 
 from pytest_aitest import Agent, MCPServer, Provider
@@ -28,12 +30,16 @@ pytestmark = [pytest.mark.integration, pytest.mark.excel]
 # Load the real production system prompt — the same one users get
 EXCEL_PROMPT = SYSTEM_PROMPT_PATH.read_text(encoding="utf-8").strip()
 
+# One provider shared by every agent in this module — the model/rate-limit
+# config is identical across tests, so there is no need to rebuild it per agent.
+_PROVIDER = Provider(model=f"azure/{DEFAULT_MODEL}", rpm=DEFAULT_RPM, tpm=DEFAULT_TPM)
+
 
 def _make_agent(
     excel_server: MCPServer,
     name: str,
     *,
-    allowed_tools: list[str] | None = None,
+    allowed_tools: Sequence[str] | None = None,
     max_turns: int = DEFAULT_MAX_TURNS,
 ) -> Agent:
     """Create an Excel agent with standard config.
@@ -43,11 +49,11 @@ def _make_agent(
     """
     return Agent(
         name=name,
-        provider=Provider(model=f"azure/{DEFAULT_MODEL}", rpm=DEFAULT_RPM, tpm=DEFAULT_TPM),
+        provider=_PROVIDER,
         mcp_servers=[excel_server],
         system_prompt=EXCEL_PROMPT,
         max_turns=max_turns,
-        allowed_tools=allowed_tools,
+        allowed_tools=list(allowed_tools) if allowed_tools is not None else None,
     )
 
 
@@ -148,10 +154,10 @@ class TestTableOperations:
 # =============================================================================
 
 # All 6 conditional format tools — tests must pick ONE from this set
-_CF_TOOLS = [
+_CF_TOOLS = (
     "add_color_scale", "add_data_bar", "add_cell_value_format",
     "add_top_bottom_format", "add_contains_text_format", "add_custom_format",
-]
+)
 
 
 class TestConditionalFormatSelection:
@@ -216,10 +222,10 @@ class TestConditionalFormatSelection:
 # =============================================================================
 
 # All 5 data validation tools
-_DV_TOOLS = [
+_DV_TOOLS = (
     "set_list_validation", "set_number_validation", "set_date_validation",
     "set_text_length_validation", "set_custom_validation",
-]
+)
 
 
 class TestDataValidationSelection: